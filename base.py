@@ -2,37 +2,77 @@
 
 import os
 import aiohttp
+import aiofiles
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from config import Config
 
+# Received data is written to disk once at least this much is pending
+WRITE_BATCH_SIZE = 256 << 10
+
+# Media probes are an optimisation and must never hold up a download for long
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=3)
+
+class FileTooLargeError(Exception):
+    """Raised when a download exceeds the allowed file size"""
+    
+    def __init__(self, size: int, exact: bool = True):
+        self.size = size
+        prefix = '' if exact else '>'
+        super().__init__(f"File too large ({prefix}{size / 1024 / 1024:.1f}MB)")
+
 class BaseDownloader(ABC):
     """Abstract base class for all platform downloaders"""
     
+    # One session (and connection pool) shared by every downloader instance
+    _shared_session: Optional[aiohttp.ClientSession] = None
+    _session_lock = asyncio.Lock()
+    # Bounds simultaneous media downloads across all platforms
+    _download_semaphore = asyncio.Semaphore(getattr(Config, 'MAX_CONCURRENT_DOWNLOADS', None) or 8)
+    # Set once the download directory has been created in this process
+    _dir_ready = False
+    
     def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
         self.download_dir = Config.DOWNLOAD_DIR
         self._ensure_download_dir()
     
     def _ensure_download_dir(self):
         """Ensure download directory exists"""
-        if not os.path.exists(self.download_dir):
-            os.makedirs(self.download_dir)
+        if BaseDownloader._dir_ready:
+            return
+        os.makedirs(self.download_dir, exist_ok=True)
+        BaseDownloader._dir_ready = True
     
     async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
-                headers={"User-Agent": Config.USER_AGENT}
-            )
-        return self.session
+        """Get or create the shared aiohttp session"""
+        cls = BaseDownloader
+        session = cls._shared_session
+        if session is not None and not session.closed:
+            return session
+        
+        async with cls._session_lock:
+            if cls._shared_session is None or cls._shared_session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=8,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+                cls._shared_session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+                    headers={"User-Agent": Config.USER_AGENT}
+                )
+            return cls._shared_session
     
-    async def close_session(self):
-        """Close aiohttp session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+    @classmethod
+    async def close_session(cls):
+        """Close the shared aiohttp session (call once on shutdown)"""
+        session = BaseDownloader._shared_session
+        if session and not session.closed:
+            await session.close()
+        BaseDownloader._shared_session = None
     
     @abstractmethod
     async def download(self, url: str) -> Dict[str, Any]:
@@ -47,29 +87,85 @@ class BaseDownloader(ABC):
         """Check if this downloader can handle the given URL"""
         pass
     
-    async def download_file(self, url: str, filename: str) -> str:
-        """Download file from URL and save to local filesystem"""
+    async def probe_media(self, url: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Fetch size and content type of a media URL without downloading its body
+        Returns: (content_length, content_type), either may be None if unknown
+        """
         session = await self.get_session()
-        file_path = os.path.join(self.download_dir, filename)
         
+        # Probing is best-effort, the download itself reports errors
         try:
-            async with session.get(url) as response:
+            async with session.head(url, allow_redirects=True, timeout=PROBE_TIMEOUT) as response:
                 if response.status == 200:
-                    with open(file_path, 'wb') as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    return file_path
-                else:
-                    raise Exception(f"HTTP {response.status}: Failed to download file")
+                    return response.content_length, self._parse_content_type(response)
+        except Exception:
+            return None, None  # Timed out or unreachable; a second probe would only add delay
+        
+        # Some CDNs reject HEAD with an error status; ask for a single byte instead
+        try:
+            async with session.get(url, headers={'Range': 'bytes=0-0'}, timeout=PROBE_TIMEOUT) as response:
+                if response.status == 206:
+                    # Content-Range: bytes 0-0/<total>
+                    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                    size = int(total) if total.isdigit() else None
+                    return size, self._parse_content_type(response)
+                if response.status == 200:
+                    return response.content_length, self._parse_content_type(response)
+        except Exception:
+            pass
+        
+        return None, None
+    
+    @staticmethod
+    def _parse_content_type(response: aiohttp.ClientResponse) -> Optional[str]:
+        """Return the bare, lowercased MIME type from a response"""
+        content_type = response.headers.get('Content-Type', '')
+        return content_type.split(';', 1)[0].strip().lower() or None
+    
+    async def download_file(self, url: str, filename: str, max_size: Optional[int] = None) -> str:
+        """
+        Download file from URL and save to local filesystem
+        Raises FileTooLargeError as soon as the file is known to exceed max_size
+        """
+        session = await self.get_session()
+        file_path = os.path.join(self.download_dir, filename)
+        
+        try:
+            async with self._download_semaphore:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        content_length = response.content_length
+                        if max_size is not None and content_length is not None and content_length > max_size:
+                            raise FileTooLargeError(content_length)
+                        
+                        written = 0
+                        pending = []
+                        pending_size = 0
+                        async with aiofiles.open(file_path, 'wb') as file:
+                            # iter_any() yields buffers as received, without re-chunking copies
+                            async for chunk in response.content.iter_any():
+                                written += len(chunk)
+                                if max_size is not None and written > max_size:
+                                    raise FileTooLargeError(written, exact=False)
+                                pending.append(chunk)
+                                pending_size += len(chunk)
+                                if pending_size >= WRITE_BATCH_SIZE:
+                                    await file.writelines(pending)
+                                    pending.clear()
+                                    pending_size = 0
+                            if pending:
+                                await file.writelines(pending)
+                        return file_path
+                    else:
+                        raise Exception(f"HTTP {response.status}: Failed to download file")
         except Exception as e:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            self.cleanup_file(file_path)
             raise e
     
     def cleanup_file(self, file_path: str):
         """Remove downloaded file"""
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            os.remove(file_path)
         except Exception:
             pass  # Ignore cleanup errors
@@ -1,36 +1,58 @@
 """File handling utilities"""
 
 import os
-import mimetypes
+import re
 from typing import Optional, Tuple
 from config import Config
 
+_EXT_TO_MIME = {
+    '.mp4': 'video/mp4',
+    '.m4v': 'video/mp4',
+    '.mov': 'video/quicktime',
+    '.avi': 'video/x-msvideo',
+    '.mpeg': 'video/mpeg',
+    '.mpg': 'video/mpeg',
+    '.webm': 'video/webm',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+_VIDEO_MIMES = frozenset({'video/mp4', 'video/mpeg', 'video/quicktime', 'video/x-msvideo', 'video/webm'})
+_IMAGE_MIMES = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/webp'})
+_VALID_EXTS = frozenset({'.mp4', '.m4v', '.avi', '.mov', '.webm', '.jpg', '.jpeg', '.png', '.gif', '.webp'})
+
+# ASCII bytes that _UNSAFE_CHARS_RE would remove, for the bytes.translate fast path
+_UNSAFE_ASCII_BYTES = bytes(
+    c for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) in '_.-')
+)
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s.-]')
+_DASH_SPACE_RE = re.compile(r'[-\s]+')
+
 class FileHandler:
     """Utility class for file operations"""
     
     @staticmethod
     def get_file_info(file_path: str) -> Tuple[int, str, str]:
         """Get file size, MIME type, and extension"""
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        file_size = os.path.getsize(file_path)
-        mime_type, _ = mimetypes.guess_type(file_path)
         ext = os.path.splitext(file_path)[1].lower()
+        mime_type = _EXT_TO_MIME.get(ext, 'application/octet-stream')
         
-        return file_size, mime_type or 'application/octet-stream', ext
+        return file_size, mime_type, ext
     
     @staticmethod
     def is_valid_media_file(file_path: str) -> bool:
         """Check if file is a valid media file"""
         try:
             _, mime_type, ext = FileHandler.get_file_info(file_path)
-            
-            valid_video_types = ['video/mp4', 'video/mpeg', 'video/quicktime', 'video/x-msvideo']
-            valid_image_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-            valid_extensions = ['.mp4', '.avi', '.mov', '.jpg', '.jpeg', '.png', '.gif', '.webp']
-            
-            return (mime_type in valid_video_types + valid_image_types) or (ext in valid_extensions)
+            return mime_type in _VIDEO_MIMES or mime_type in _IMAGE_MIMES or ext in _VALID_EXTS
         except:
             return False
     
@@ -39,21 +61,24 @@ class FileHandler:
         """Clean up old files from directory"""
         import time
         
-        if not os.path.exists(directory):
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
             return
         
         current_time = time.time()
         max_age_seconds = max_age_hours * 3600
         
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-            if os.path.isfile(file_path):
-                file_age = current_time - os.path.getmtime(file_path)
-                if file_age > max_age_seconds:
-                    try:
-                        os.remove(file_path)
-                    except:
-                        pass  # Ignore cleanup errors
+        with entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    file_age = current_time - entry.stat(follow_symlinks=False).st_mtime
+                    if file_age > max_age_seconds:
+                        os.remove(entry.path)
+                except OSError:
+                    pass  # Ignore cleanup errors
     
     @staticmethod
     def ensure_telegram_compatibility(file_path: str) -> bool:
@@ -62,9 +87,9 @@ class FileHandler:
             file_size, mime_type, ext = FileHandler.get_file_info(file_path)
             
             # Check file size limits
-            if 'video' in mime_type:
+            if mime_type in _VIDEO_MIMES:
                 return file_size <= Config.MAX_VIDEO_SIZE
-            elif 'image' in mime_type:
+            elif mime_type in _IMAGE_MIMES:
                 return file_size <= Config.MAX_PHOTO_SIZE
             else:
                 return False
@@ -74,11 +99,12 @@ class FileHandler:
     @staticmethod
     def get_safe_filename(filename: str) -> str:
         """Generate a safe filename for the filesystem"""
-        import re
-        
         # Remove or replace unsafe characters
-        safe_filename = re.sub(r'[^\w\s.-]', '', filename)
-        safe_filename = re.sub(r'[-\s]+', '-', safe_filename)
+        if filename.isascii():
+            safe_filename = filename.encode('ascii').translate(None, _UNSAFE_ASCII_BYTES).decode('ascii')
+        else:
+            safe_filename = _UNSAFE_CHARS_RE.sub('', filename)
+        safe_filename = _DASH_SPACE_RE.sub('-', safe_filename)
         
         # Limit length
         if len(safe_filename) > 100:
@@ -1,21 +1,23 @@
 """Instagram downloader"""
 
 import re
-import json
+import orjson
 from typing import Dict, Any
-from .base import BaseDownloader
+from .base import BaseDownloader, FileTooLargeError
+from .url_parser import URLParser
 from config import Config
 
+_ADDITIONAL_DATA_RE = re.compile(rb'window\.__additionalDataLoaded\([^,]+,({.*?})\);')
+# Capture the quoted JSON string so orjson can undo every escape sequence
+_GRAPH_IMAGE_RE = re.compile(rb'"GraphImage"[^}]+"display_url"\s*:\s*("(?:\\.|[^"\\])*")')
+_GRAPH_VIDEO_RE = re.compile(rb'"GraphVideo"[^}]+"video_url"\s*:\s*("(?:\\.|[^"\\])*")')
+
 class InstagramDownloader(BaseDownloader):
     """Instagram photo and video downloader"""
     
     def can_handle(self, url: str) -> bool:
         """Check if URL is from Instagram"""
-        instagram_patterns = [
-            r'instagram\.com',
-            r'instagr\.am'
-        ]
-        return any(re.search(pattern, url.lower()) for pattern in instagram_patterns)
+        return URLParser.extract_platform(url) == 'instagram'
     
     async def download(self, url: str) -> Dict[str, Any]:
         """Download content from Instagram URL"""
@@ -29,6 +31,11 @@ class InstagramDownloader(BaseDownloader):
             media_url = media_info['media_url']
             is_video = media_info['is_video']
             
+            content_length, content_type = await self.probe_media(media_url)
+            # Generic types like application/octet-stream say nothing; keep the scraped flag
+            if content_type and content_type.startswith(('video/', 'image/')):
+                is_video = content_type.startswith('video/')
+            
             if is_video:
                 filename = f"instagram_{media_info['media_id']}.mp4"
                 media_type = 'video'
@@ -38,20 +45,11 @@ class InstagramDownloader(BaseDownloader):
                 media_type = 'photo'
                 size_limit = Config.MAX_PHOTO_SIZE
             
-            # Download the file
-            file_path = await self.download_file(media_url, filename)
+            if content_length is not None and content_length > size_limit:
+                raise FileTooLargeError(content_length)
             
-            # Check file size
-            import os
-            file_size = os.path.getsize(file_path)
-            if file_size > size_limit:
-                self.cleanup_file(file_path)
-                return {
-                    'success': False,
-                    'error': f"File too large ({file_size / 1024 / 1024:.1f}MB)",
-                    'file_path': None,
-                    'media_type': None
-                }
+            # Download the file
+            file_path = await self.download_file(media_url, filename, max_size=size_limit)
             
             return {
                 'success': True,
@@ -61,6 +59,13 @@ class InstagramDownloader(BaseDownloader):
                 'error': None
             }
             
+        except FileTooLargeError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'file_path': None,
+                'media_type': None
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -75,17 +80,13 @@ class InstagramDownloader(BaseDownloader):
             session = await self.get_session()
             
             # Convert to embed URL for easier parsing
-            shortcode_match = re.search(r'/p/([A-Za-z0-9_-]+)', url)
-            if not shortcode_match:
-                shortcode_match = re.search(r'/reel/([A-Za-z0-9_-]+)', url)
-            
-            if not shortcode_match:
+            shortcode = URLParser.extract_instagram_shortcode(url)
+            if not shortcode:
                 return {
                     'success': False,
                     'error': "Could not extract media shortcode from URL"
                 }
             
-            shortcode = shortcode_match.group(1)
             embed_url = f"https://www.instagram.com/p/{shortcode}/embed/"
             
             # Get embed page content
@@ -96,29 +97,43 @@ class InstagramDownloader(BaseDownloader):
                         'error': f"Failed to access Instagram embed: HTTP {response.status}"
                     }
                 
-                content = await response.text()
+                content = await response.read()
                 
                 # Look for media data in the page
-                script_match = re.search(r'window\.__additionalDataLoaded\([^,]+,({.*?})\);', content)
+                script_match = _ADDITIONAL_DATA_RE.search(content)
                 if not script_match:
                     # Try alternative pattern
-                    script_match = re.search(r'"GraphImage"[^}]+display_url":"([^"]+)"', content)
+                    script_match = _GRAPH_IMAGE_RE.search(content)
                     if script_match:
+                        try:
+                            media_url = orjson.loads(script_match.group(1))
+                        except orjson.JSONDecodeError:
+                            return {
+                                'success': False,
+                                'error': "Failed to parse media data"
+                            }
                         return {
                             'success': True,
                             'media_id': shortcode,
-                            'media_url': script_match.group(1).replace('\\u0026', '&'),
+                            'media_url': media_url,
                             'is_video': False,
                             'caption': 'Instagram Photo'
                         }
                     
                     # Try video pattern
-                    script_match = re.search(r'"GraphVideo"[^}]+video_url":"([^"]+)"', content)
+                    script_match = _GRAPH_VIDEO_RE.search(content)
                     if script_match:
+                        try:
+                            media_url = orjson.loads(script_match.group(1))
+                        except orjson.JSONDecodeError:
+                            return {
+                                'success': False,
+                                'error': "Failed to parse media data"
+                            }
                         return {
                             'success': True,
                             'media_id': shortcode,
-                            'media_url': script_match.group(1).replace('\\u0026', '&'),
+                            'media_url': media_url,
                             'is_video': True,
                             'caption': 'Instagram Video'
                         }
@@ -129,31 +144,33 @@ class InstagramDownloader(BaseDownloader):
                     }
                 
                 try:
-                    data = json.loads(script_match.group(1))
-                    media_data = data.get('graphql', {}).get('shortcode_media', {})
+                    data = orjson.loads(script_match.group(1))
                     
+                    try:
+                        media_data = data['graphql']['shortcode_media']
+                    except (KeyError, TypeError):
+                        media_data = None
                     if not media_data:
                         return {
                             'success': False,
                             'error': "Media data not found in response"
                         }
                     
-                    is_video = media_data.get('is_video', False)
-                    if is_video:
-                        media_url = media_data.get('video_url')
-                    else:
-                        media_url = media_data.get('display_url')
-                    
+                    is_video = bool(media_data.get('is_video'))
+                    try:
+                        media_url = media_data['video_url'] if is_video else media_data['display_url']
+                    except KeyError:
+                        media_url = None
                     if not media_url:
                         return {
                             'success': False,
                             'error': "Could not find media URL"
                         }
                     
-                    caption = ""
-                    edges = media_data.get('edge_media_to_caption', {}).get('edges', [])
-                    if edges:
-                        caption = edges[0].get('node', {}).get('text', '')
+                    try:
+                        caption = media_data['edge_media_to_caption']['edges'][0]['node']['text'] or ""
+                    except (KeyError, IndexError, TypeError):
+                        caption = ""
                     
                     return {
                         'success': True,
@@ -163,7 +180,7 @@ class InstagramDownloader(BaseDownloader):
                         'caption': caption[:100] + '...' if len(caption) > 100 else caption
                     }
                     
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     return {
                         'success': False,
                         'error': "Failed to parse media data"
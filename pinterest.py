@@ -1,22 +1,40 @@
 """Pinterest downloader"""
 
 import re
-import json
+import orjson
 from typing import Dict, Any
-from .base import BaseDownloader
+from .base import BaseDownloader, FileTooLargeError
+from .url_parser import URLParser
 from config import Config
 
+_IMAGE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+}
+_URL_IMAGE_EXTENSIONS = {
+    'jpg': 'jpg',
+    'jpeg': 'jpg',
+    'png': 'png',
+    'gif': 'gif',
+    'webp': 'webp',
+}
+_URL_VIDEO_EXTENSIONS = frozenset({'mp4', 'webm'})
+
+# Groups include the surrounding quotes so the value can go straight to orjson.loads
+_PIN_URL_RE = re.compile(
+    rb'"url":\s*("(?:\\.|[^"\\])+?\.(?:jpg|jpeg|png|mp4|webm)(?:\\.|[^"\\])*")'
+)
+_PIN_TITLE_RE = re.compile(rb'"title":\s*("(?:\\.|[^"\\])*")')
+_OG_IMAGE_RE = re.compile(rb'<meta property="og:image" content="([^"]+)"')
+
 class PinterestDownloader(BaseDownloader):
     """Pinterest photo and video downloader"""
     
     def can_handle(self, url: str) -> bool:
         """Check if URL is from Pinterest"""
-        pinterest_patterns = [
-            r'pinterest\.com',
-            r'pinterest\.[a-z]+',
-            r'pin\.it'
-        ]
-        return any(re.search(pattern, url.lower()) for pattern in pinterest_patterns)
+        return URLParser.extract_platform(url) == 'pinterest'
     
     async def download(self, url: str) -> Dict[str, Any]:
         """Download content from Pinterest URL"""
@@ -30,37 +48,31 @@ class PinterestDownloader(BaseDownloader):
             media_url = pin_info['media_url']
             is_video = pin_info['is_video']
             
+            content_length, content_type = await self.probe_media(media_url)
+            # Generic types like application/octet-stream say nothing; keep the scraped flag
+            if content_type and content_type.startswith(('video/', 'image/')):
+                is_video = content_type.startswith('video/')
+            
             if is_video:
                 filename = f"pinterest_{pin_info['pin_id']}.mp4"
                 media_type = 'video'
                 size_limit = Config.MAX_VIDEO_SIZE
             else:
-                # Determine image extension from URL
-                if '.jpg' in media_url.lower() or '.jpeg' in media_url.lower():
-                    ext = 'jpg'
-                elif '.png' in media_url.lower():
-                    ext = 'png'
-                else:
-                    ext = 'jpg'  # default
+                # Determine image extension from Content-Type, falling back to URL
+                ext = _IMAGE_EXTENSIONS.get(content_type)
+                if ext is None:
+                    url_ext = URLParser.extract_extension(media_url)
+                    ext = _URL_IMAGE_EXTENSIONS.get(url_ext, 'jpg')
                 
                 filename = f"pinterest_{pin_info['pin_id']}.{ext}"
                 media_type = 'photo'
                 size_limit = Config.MAX_PHOTO_SIZE
             
-            # Download the file
-            file_path = await self.download_file(media_url, filename)
+            if content_length is not None and content_length > size_limit:
+                raise FileTooLargeError(content_length)
             
-            # Check file size
-            import os
-            file_size = os.path.getsize(file_path)
-            if file_size > size_limit:
-                self.cleanup_file(file_path)
-                return {
-                    'success': False,
-                    'error': f"File too large ({file_size / 1024 / 1024:.1f}MB)",
-                    'file_path': None,
-                    'media_type': None
-                }
+            # Download the file
+            file_path = await self.download_file(media_url, filename, max_size=size_limit)
             
             return {
                 'success': True,
@@ -70,6 +82,13 @@ class PinterestDownloader(BaseDownloader):
                 'error': None
             }
             
+        except FileTooLargeError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'file_path': None,
+                'media_type': None
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -84,26 +103,23 @@ class PinterestDownloader(BaseDownloader):
             session = await self.get_session()
             
             # Handle pin.it redirects
-            if 'pin.it' in url:
+            if URLParser.extract_host(url) == 'pin.it':
                 async with session.get(url, allow_redirects=True) as response:
                     url = str(response.url)
             
             # Extract pin ID from URL
-            pin_id_match = re.search(r'/pin/(\d+)', url)
-            if not pin_id_match:
+            pin_id = URLParser.extract_pinterest_pin_id(url)
+            if not pin_id:
                 return {
                     'success': False,
                     'error': "Could not extract pin ID from URL"
                 }
             
-            pin_id = pin_id_match.group(1)
-            
             # Get pin page content
             headers = {
                 'User-Agent': Config.USER_AGENT,
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
                 'Connection': 'keep-alive',
             }
             
@@ -114,41 +130,46 @@ class PinterestDownloader(BaseDownloader):
                         'error': f"Failed to access Pinterest page: HTTP {response.status}"
                     }
                 
-                content = await response.text()
+                content = await response.read()
                 
-                # Look for pin data in the page scripts
-                script_matches = re.findall(r'<script[^>]*>([^<]*)</script>', content, re.DOTALL)
+                # Look for the media URL in the pin's "images" object, preferring the original size;
+                # searching from there skips avatars and other images earlier in the page
+                media_url = None
+                url_match = None
+                images_pos = content.find(b'"images"')
+                if images_pos != -1:
+                    orig_pos = content.find(b'"orig"', images_pos)
+                    url_match = _PIN_URL_RE.search(content, orig_pos if orig_pos != -1 else images_pos)
+                if url_match:
+                    try:
+                        media_url = orjson.loads(url_match.group(1))
+                    except orjson.JSONDecodeError:
+                        pass  # Malformed escape; fall back to og:image below
                 
-                for script in script_matches:
-                    if 'pinterestapp:pins' in script or '"Pin"' in script:
-                        # Try to extract JSON data
-                        json_match = re.search(r'\{[^}]*"images"[^}]*\}', script)
-                        if json_match:
-                            try:
-                                # Find the media URL in various possible formats
-                                url_match = re.search(r'"url":\s*"([^"]+\.(?:jpg|jpeg|png|mp4|webm)[^"]*)"', script)
-                                if url_match:
-                                    media_url = url_match.group(1).replace('\\/', '/')
-                                    is_video = any(ext in media_url.lower() for ext in ['.mp4', '.webm'])
-                                    
-                                    # Try to extract title
-                                    title_match = re.search(r'"title":\s*"([^"]*)"', script)
-                                    title = title_match.group(1) if title_match else "Pinterest Media"
-                                    
-                                    return {
-                                        'success': True,
-                                        'pin_id': pin_id,
-                                        'media_url': media_url,
-                                        'is_video': is_video,
-                                        'title': title[:100] + '...' if len(title) > 100 else title
-                                    }
-                            except:
-                                continue
+                if media_url:
+                    is_video = URLParser.extract_extension(media_url) in _URL_VIDEO_EXTENSIONS
+                    
+                    # Try to extract title
+                    title = "Pinterest Media"
+                    title_match = _PIN_TITLE_RE.search(content)
+                    if title_match:
+                        try:
+                            title = orjson.loads(title_match.group(1))
+                        except orjson.JSONDecodeError:
+                            pass  # Keep the default title, the media URL is what matters
+                    
+                    return {
+                        'success': True,
+                        'pin_id': pin_id,
+                        'media_url': media_url,
+                        'is_video': is_video,
+                        'title': title[:100] + '...' if len(title) > 100 else title
+                    }
                 
                 # Fallback: look for og:image meta tag
-                og_image_match = re.search(r'<meta property="og:image" content="([^"]+)"', content)
+                og_image_match = _OG_IMAGE_RE.search(content)
                 if og_image_match:
-                    media_url = og_image_match.group(1)
+                    media_url = og_image_match.group(1).decode()
                     return {
                         'success': True,
                         'pin_id': pin_id,
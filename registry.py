@@ -0,0 +1,38 @@
+"""Platform-based downloader dispatch"""
+
+from typing import Dict, Any, Optional
+from .base import BaseDownloader
+from .instagram import InstagramDownloader
+from .pinterest import PinterestDownloader
+from .tiktok import TikTokDownloader
+from .url_parser import URLParser
+
+class DownloaderRegistry:
+    """Routes URLs to persistent downloader instances by platform name"""
+    
+    def __init__(self):
+        self._downloaders: Dict[str, BaseDownloader] = {
+            'instagram': InstagramDownloader(),
+            'tiktok': TikTokDownloader(),
+            'pinterest': PinterestDownloader()
+        }
+    
+    def get_downloader(self, url: str) -> Optional[BaseDownloader]:
+        """Return the downloader for the URL's platform, or None if unsupported"""
+        return self._downloaders.get(URLParser.extract_platform(url))
+    
+    async def download(self, url: str) -> Dict[str, Any]:
+        """Download media from URL using the matching platform downloader"""
+        downloader = self.get_downloader(url)
+        if downloader is None:
+            return {
+                'success': False,
+                'error': "Unsupported platform",
+                'file_path': None,
+                'media_type': None
+            }
+        return await downloader.download(url)
+    
+    async def close(self):
+        """Release the shared HTTP session (call once on shutdown)"""
+        await BaseDownloader.close_session()
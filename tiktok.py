@@ -1,23 +1,24 @@
 """TikTok downloader"""
 
 import re
-import json
+import orjson
 import asyncio
-from typing import Dict, Any
-from .base import BaseDownloader
+from typing import Dict, Any, Optional
+from .base import BaseDownloader, FileTooLargeError
+from .url_parser import URLParser
 from config import Config
 
+_UNIVERSAL_DATA_RE = re.compile(
+    rb'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__"[^>]*>(.*?)</script>', re.DOTALL
+)
+_SIGI_STATE_RE = re.compile(rb'<script id="SIGI_STATE"[^>]*>(.*?)</script>', re.DOTALL)
+
 class TikTokDownloader(BaseDownloader):
     """TikTok video and photo downloader"""
     
     def can_handle(self, url: str) -> bool:
         """Check if URL is from TikTok"""
-        tiktok_patterns = [
-            r'tiktok\.com',
-            r'vm\.tiktok\.com',
-            r'vt\.tiktok\.com'
-        ]
-        return any(re.search(pattern, url.lower()) for pattern in tiktok_patterns)
+        return URLParser.extract_platform(url) == 'tiktok'
     
     async def download(self, url: str) -> Dict[str, Any]:
         """Download content from TikTok URL"""
@@ -29,19 +30,9 @@ class TikTokDownloader(BaseDownloader):
             
             # Download the video file
             filename = f"tiktok_{video_info['video_id']}.mp4"
-            file_path = await self.download_file(video_info['download_url'], filename)
-            
-            # Check file size
-            import os
-            file_size = os.path.getsize(file_path)
-            if file_size > Config.MAX_VIDEO_SIZE:
-                self.cleanup_file(file_path)
-                return {
-                    'success': False,
-                    'error': f"File too large ({file_size / 1024 / 1024:.1f}MB)",
-                    'file_path': None,
-                    'media_type': None
-                }
+            file_path = await self.download_file(
+                video_info['download_url'], filename, max_size=Config.MAX_VIDEO_SIZE
+            )
             
             return {
                 'success': True,
@@ -51,6 +42,13 @@ class TikTokDownloader(BaseDownloader):
                 'error': None
             }
             
+        except FileTooLargeError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'file_path': None,
+                'media_type': None
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -64,73 +62,95 @@ class TikTokDownloader(BaseDownloader):
         try:
             session = await self.get_session()
             
-            # First, resolve the URL if it's shortened
+            # Fetch the video page, following short-link redirects in the same request
             async with session.get(url, allow_redirects=True) as response:
                 final_url = str(response.url)
-            
-            # Extract video ID from URL
-            video_id_match = re.search(r'/video/(\d+)', final_url)
-            if not video_id_match:
-                return {
-                    'success': False,
-                    'error': "Could not extract video ID from URL"
-                }
-            
-            video_id = video_id_match.group(1)
-            
-            # Get video page content
-            async with session.get(final_url) as response:
+                
+                # Extract video ID from the resolved URL
+                video_id = URLParser.extract_tiktok_video_id(final_url)
+                if not video_id:
+                    return {
+                        'success': False,
+                        'error': "Could not extract video ID from URL"
+                    }
+                
                 if response.status != 200:
                     return {
                         'success': False,
                         'error': f"Failed to access TikTok page: HTTP {response.status}"
                     }
                 
-                content = await response.text()
+                content = await response.read()
                 
-                # Extract video data from page script
-                script_match = re.search(r'<script id="SIGI_STATE"[^>]*>(.*?)</script>', content)
-                if not script_match:
+                # Extract video data from page scripts; newer pages use the rehydration blob,
+                # but try every blob present since either may lack this video
+                scripts = [m for m in (_UNIVERSAL_DATA_RE.search(content), _SIGI_STATE_RE.search(content)) if m]
+                if not scripts:
                     return {
                         'success': False,
                         'error': "Could not find video data in page"
                     }
                 
-                try:
-                    data = json.loads(script_match.group(1))
-                    video_data = data.get('ItemModule', {}).get(video_id, {})
-                    
-                    if not video_data:
-                        return {
-                            'success': False,
-                            'error': "Video data not found"
-                        }
-                    
-                    # Extract download URL
-                    video_obj = video_data.get('video', {})
-                    download_url = video_obj.get('downloadAddr') or video_obj.get('playAddr')
-                    
-                    if not download_url:
-                        return {
-                            'success': False,
-                            'error': "Could not find video download URL"
-                        }
-                    
+                video_data = None
+                parsed_any = False
+                for script_match in scripts:
+                    try:
+                        data = orjson.loads(script_match.group(1))
+                    except orjson.JSONDecodeError:
+                        continue
+                    parsed_any = True
+                    video_data = self._find_video_data(data, video_id)
+                    if video_data:
+                        break
+                
+                if not parsed_any:
                     return {
-                        'success': True,
-                        'video_id': video_id,
-                        'download_url': download_url,
-                        'title': video_data.get('desc', 'TikTok Video')
+                        'success': False,
+                        'error': "Failed to parse video data"
                     }
-                    
-                except json.JSONDecodeError:
+                
+                if not video_data:
                     return {
                         'success': False,
-                        'error': "Failed to parse video data"
+                        'error': "Video data not found"
+                    }
+                
+                # Extract download URL
+                video_obj = video_data.get('video', {})
+                download_url = video_obj.get('downloadAddr') or video_obj.get('playAddr')
+                
+                if not download_url:
+                    return {
+                        'success': False,
+                        'error': "Could not find video download URL"
                     }
-                    
+                
+                return {
+                    'success': True,
+                    'video_id': video_id,
+                    'download_url': download_url,
+                    'title': video_data.get('desc', 'TikTok Video')
+                }
+                
         except Exception as e:
             return {
                 'success': False,
                 'error': f"Failed to get video info: {str(e)}"
             }
+    
+    @staticmethod
+    def _find_video_data(data: Any, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return the item for video_id from a parsed page blob, or None if it is not there"""
+        # Rehydration layout; it describes whatever the page rendered, so check the id
+        try:
+            item = data['__DEFAULT_SCOPE__']['webapp.video-detail']['itemInfo']['itemStruct']
+            if str(item['id']) == video_id:
+                return item
+        except (KeyError, TypeError):
+            pass
+        
+        # SIGI_STATE layout
+        try:
+            return data['ItemModule'][video_id]
+        except (KeyError, TypeError):
+            return None
@@ -4,24 +4,73 @@ import re
 from typing import Optional
 from urllib.parse import urlparse
 
+_PLATFORM_BY_HOST = {
+    'youtube.com': 'youtube',
+    'm.youtube.com': 'youtube',
+    'music.youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'tiktok.com': 'tiktok',
+    'vm.tiktok.com': 'tiktok',
+    'vt.tiktok.com': 'tiktok',
+    'm.tiktok.com': 'tiktok',
+    'instagram.com': 'instagram',
+    'instagr.am': 'instagram',
+    'pinterest.com': 'pinterest',
+    'pin.it': 'pinterest',
+}
+
+_PLATFORM_BY_SUFFIX = (
+    ('.youtube.com', 'youtube'),
+    ('.tiktok.com', 'tiktok'),
+    ('.instagram.com', 'instagram'),
+    ('.pinterest.com', 'pinterest'),
+)
+
+_YOUTUBE_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/shorts\/)([a-zA-Z0-9_-]{11})'
+)
+_TIKTOK_VIDEO_ID_RE = re.compile(r'/video/(\d+)')
+_INSTAGRAM_SHORTCODE_RE = re.compile(r'/(?:p|reel|tv)/([A-Za-z0-9_-]+)')
+_PINTEREST_PIN_ID_RE = re.compile(r'/pin/(\d+)')
+
 class URLParser:
     """Utility class for parsing and validating URLs"""
     
     @staticmethod
     def extract_platform(url: str) -> Optional[str]:
         """Extract platform name from URL"""
-        url_lower = url.lower()
-        
-        if any(domain in url_lower for domain in ['youtube.com', 'youtu.be']):
-            return 'youtube'
-        elif any(domain in url_lower for domain in ['tiktok.com', 'vm.tiktok.com', 'vt.tiktok.com']):
-            return 'tiktok'
-        elif any(domain in url_lower for domain in ['instagram.com', 'instagr.am']):
-            return 'instagram'
-        elif any(domain in url_lower for domain in ['pinterest.com', 'pinterest.', 'pin.it']):
-            return 'pinterest'
-        else:
+        host = URLParser.extract_host(url)
+        return _PLATFORM_BY_HOST.get(host) or URLParser._suffix_match(host)
+    
+    @staticmethod
+    def extract_host(url: str) -> str:
+        """Return the host of a URL without a leading 'www.' (urlparse lowercases it)"""
+        try:
+            parsed = urlparse(url)
+            if not parsed.netloc:
+                parsed = urlparse('//' + url)  # Allow scheme-less links like "tiktok.com/..."
+            host = parsed.hostname or ''
+        except ValueError:
+            return ''
+        return host.removeprefix('www.')
+    
+    @staticmethod
+    def extract_extension(url: str) -> str:
+        """Return the lowercased file extension of the URL path without the dot ('' if none)"""
+        name = urlparse(url).path.rpartition('/')[2]
+        return name.rpartition('.')[2].lower() if '.' in name else ''
+    
+    @staticmethod
+    def _suffix_match(host: str) -> Optional[str]:
+        """Match subdomains and regional Pinterest domains (pinterest.co.uk etc.)"""
+        if not host:
             return None
+        for suffix, platform in _PLATFORM_BY_SUFFIX:
+            if host.endswith(suffix):
+                return platform
+        if host.startswith('pinterest.') or '.pinterest.' in host:
+            return 'pinterest'
+        return None
     
     @staticmethod
     def is_valid_url(url: str) -> bool:
@@ -49,42 +98,23 @@ class URLParser:
     @staticmethod
     def extract_youtube_video_id(url: str) -> Optional[str]:
         """Extract YouTube video ID from URL"""
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return None
+        match = _YOUTUBE_VIDEO_ID_RE.search(url)
+        return match.group(1) if match else None
     
     @staticmethod
     def extract_tiktok_video_id(url: str) -> Optional[str]:
         """Extract TikTok video ID from URL"""
-        match = re.search(r'/video/(\d+)', url)
+        match = _TIKTOK_VIDEO_ID_RE.search(url)
         return match.group(1) if match else None
     
     @staticmethod
     def extract_instagram_shortcode(url: str) -> Optional[str]:
         """Extract Instagram shortcode from URL"""
-        patterns = [
-            r'/p/([A-Za-z0-9_-]+)',
-            r'/reel/([A-Za-z0-9_-]+)',
-            r'/tv/([A-Za-z0-9_-]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return None
+        match = _INSTAGRAM_SHORTCODE_RE.search(url)
+        return match.group(1) if match else None
     
     @staticmethod
     def extract_pinterest_pin_id(url: str) -> Optional[str]:
         """Extract Pinterest pin ID from URL"""
-        match = re.search(r'/pin/(\d+)', url)
+        match = _PINTEREST_PIN_ID_RE.search(url)
         return match.group(1) if match else None